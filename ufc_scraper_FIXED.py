@@ -1,40 +1,117 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
+import lxml.html
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor
+import bisect
 import csv
-import time
+import gzip
+import hashlib
+import json
+import logging
 import os
 import re
-from collections import defaultdict, Counter
-from datetime import datetime, date
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from functools import lru_cache
 from typing import Optional, Tuple, Dict, List
+from urllib.parse import urlparse
 
 # === CONFIG ===
 # Updated to match your OneDrive path
 CSV_PATH = r"C:\Users\fresh\OneDrive\Desktop\Real Website\fight data scraper\ufc_fight_data.csv"
 REQUEST_TIMEOUT = 30
-SLEEP_BETWEEN_REQUESTS = 1
+CONNECT_TIMEOUT = 10      # fail fast on a dead connect; REQUEST_TIMEOUT still bounds the whole GET
+MAX_CONCURRENCY = 15      # max in-flight requests to ufcstats.com
+EVENT_BATCH = 8           # event cards scraped concurrently
+RETRY_STATUSES = {429, 500, 502, 503, 504}  # transient HTTP errors worth retrying
+RETRY_BACKOFF = 0.5       # seconds before the first retry; doubles on each attempt
+RATE_LIMIT = 10           # requests/sec per host; idle time banks up to this many for a burst
 UPDATE_EXISTING = False   # False = skip fights already in CSV; True = refresh fights on the latest date
 BACKFILL_ALL = False      # False = only events newer than latest CSV date; True = scan all events to fill any gaps
+MAX_EVENTS = int(os.environ.get('MAX_EVENTS', 0)) or None  # test runs: only the OLDEST N due events, so the next run resumes after them; unset = all
+HTML_CACHE_DIR = os.environ.get('HTML_CACHE_DIR') or None  # gzip page cache for dev re-runs; unset = always fetch
+HTML_CACHE_TTL = timedelta(days=7)    # cached pages older than this are fetched again
+CSV_SIDECAR = False       # True = also save <csv>.rows.json, which reloads in about half the memory (not faster)
+LOG_LEVEL = logging.INFO  # logging.DEBUG also prints per-fight scrape details
+
+log = logging.getLogger(__name__)
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
 }
 
+# Priority columns (includes requested new columns)
+FIELDNAMES_PRIORITY = [
+    'event_date', 'event_location', 'fighter_1', 'fighter_2', 'result',
+    'method_main', 'method_detail', 'round', 'time',
+    'fighter_1_kd', 'fighter_1_str', 'fighter_1_td', 'fighter_1_sub',
+    'fighter_2_kd', 'fighter_2_str', 'fighter_2_td', 'fighter_2_sub',
+    'weight_class',
+    'fighter_1_record', 'fighter_1_height', 'fighter_1_weight', 'fighter_1_reach',
+    'fighter_1_stance', 'fighter_1_dob',
+    'fighter_1_slpm','fighter_1_str_acc','fighter_1_sapm','fighter_1_str_def',
+    'fighter_1_td_avg','fighter_1_td_acc','fighter_1_td_def','fighter_1_sub_avg',
+    'fighter_2_record', 'fighter_2_height', 'fighter_2_weight', 'fighter_2_reach',
+    'fighter_2_stance', 'fighter_2_dob',
+    'fighter_2_slpm','fighter_2_str_acc','fighter_2_sapm','fighter_2_str_def',
+    'fighter_2_td_avg','fighter_2_td_acc','fighter_2_td_def','fighter_2_sub_avg',
+    # New/derived columns you asked for:
+    'fighter_1_born','fighter_1_gym','fighter_2_born','fighter_2_gym',
+    'fighter_1_ufcwins','fighter_1_ufcloss','fighter_2_ufcwins','fighter_2_ufcloss',
+    'fighter_1_active','fighter_2_active',
+    # Fight details (NEW):
+    'f1_total_kd','f2_total_kd',
+    'f1_sig_str_landed','f1_sig_str_attempted','f1_sig_str_pct',
+    'f2_sig_str_landed','f2_sig_str_attempted','f2_sig_str_pct',
+    'f1_total_str_landed','f1_total_str_attempted',
+    'f2_total_str_landed','f2_total_str_attempted',
+    'f1_td_landed','f1_td_attempted','f1_td_pct',
+    'f2_td_landed','f2_td_attempted','f2_td_pct',
+    'f1_sub_att','f2_sub_att',
+    'f1_reversals','f2_reversals',
+    'f1_ctrl_time','f2_ctrl_time',
+    'f1_head_landed','f1_head_attempted',
+    'f2_head_landed','f2_head_attempted',
+    'f1_body_landed','f1_body_attempted',
+    'f2_body_landed','f2_body_attempted',
+    'f1_leg_landed','f1_leg_attempted',
+    'f2_leg_landed','f2_leg_attempted',
+    'f1_distance_landed','f1_distance_attempted',
+    'f2_distance_landed','f2_distance_attempted',
+    'f1_clinch_landed','f1_clinch_attempted',
+    'f2_clinch_landed','f2_clinch_attempted',
+    'f1_ground_landed','f1_ground_attempted',
+    'f2_ground_landed','f2_ground_attempted',
+    # If you already have these in your CSV, keeping them here ensures stable ordering:
+    'fighter_1_wins','fighter_2_wins',
+]
+
 # ---------- Normalization helpers ----------
 
+# Compiled once at import; these run for every CSV row and every stats cell.
+_X_OF_Y = re.compile(r'(\d+)\s+of\s+(\d+)')
+_LEAD_DIGITS = re.compile(r'(\d+)')
+_WS = re.compile(r'\s+')
+_BOM_CHARS = re.compile(r'[\ufeff\u200b\u200c\u200d]')
+
 def norm_key(k: str) -> str:
     """Normalize CSV header keys: strip BOM/ZW chars, trim, lowercase, spaces->underscore."""
     if k is None:
         return ""
-    k = k.replace("\ufeff", "").replace("\u200b", "").replace("\u200c", "").replace("\u200d", "")
+    k = _BOM_CHARS.sub("", k)
     k = k.strip().lower()
-    k = re.sub(r"\s+", " ", k).replace(" ", "_")
+    k = _WS.sub(" ", k).replace(" ", "_")
     return k
 
+@lru_cache(maxsize=16384)
 def norm_name(name: str) -> str:
     if not name:
         return ""
-    return re.sub(r"\s+", " ", name).strip().casefold()
+    return _WS.sub(" ", name).strip().casefold()
 
 DATE_FORMATS = [
     "%B %d, %Y",   # August 23, 2025
@@ -47,10 +124,29 @@ DATE_FORMATS = [
     "%B-%d-%Y",
 ]
 
+def _guess_date_format(s: str) -> Optional[str]:
+    """Pick the one DATE_FORMATS entry a date string can match, judging by its shape."""
+    if len(s) > 4 and s[4] == '-':
+        return "%Y-%m-%d"
+    if '/' in s:
+        return "%m/%d/%Y"
+    if s[:3].isalpha() and ', ' in s:
+        month = s.split(' ', 1)[0]
+        return "%B %d, %Y" if len(month) > 3 else "%b %d, %Y"
+    return None
+
+@lru_cache(maxsize=4096)
 def parse_date_to_obj(s: str) -> Optional[date]:
     if not s:
         return None
-    s = re.sub(r"\s+", " ", s.strip())
+    s = _WS.sub(" ", s.strip())
+    # Fast path: one strptime for the common shapes instead of a failing try per format
+    fmt = _guess_date_format(s)
+    if fmt:
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            pass
     for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(s, fmt).date()
@@ -64,49 +160,151 @@ def parse_date_to_obj(s: str) -> Optional[date]:
             pass
     return None
 
+# Rows cache derived values under keys starting with _HIDDEN. A real CSV
+# header never starts with NUL, so these can't shadow a column (a leading
+# '_' could), and write_csv/merge_rows drop them by the prefix.
+_HIDDEN = '\0'
+_DATE_OBJ = _HIDDEN + 'event_date_obj'
+_F1_NORM = _HIDDEN + 'f1_norm'
+_F2_NORM = _HIDDEN + 'f2_norm'
+
+def row_date(r: dict) -> Optional[date]:
+    """Parsed event_date of a row, cached on the row under the hidden _DATE_OBJ key."""
+    if _DATE_OBJ not in r:
+        r[_DATE_OBJ] = parse_date_to_obj(r.get('event_date', ''))
+    return r[_DATE_OBJ]
+
+def row_names(r: dict) -> Tuple[str, str]:
+    """norm_name of fighter_1/fighter_2, cached on the row under _F1_NORM/_F2_NORM."""
+    if _F1_NORM not in r:
+        r[_F1_NORM] = norm_name(r.get('fighter_1', ''))
+        r[_F2_NORM] = norm_name(r.get('fighter_2', ''))
+    return r[_F1_NORM], r[_F2_NORM]
+
 def to_iso(d: Optional[date]) -> str:
     return d.isoformat() if isinstance(d, date) else ""
 
 def legacy_key(date_str: str, f1: str, f2: str) -> str:
     """Order-insensitive key using ISO date + normalized names."""
-    iso = to_iso(parse_date_to_obj(date_str))
-    a, b = norm_name(f1), norm_name(f2)
-    if a <= b:
-        return f"{iso}|{a}|{b}"
-    else:
-        return f"{iso}|{b}|{a}"
+    return legacy_key_fast(to_iso(parse_date_to_obj(date_str)), norm_name(f1), norm_name(f2))
+
+def legacy_key_fast(iso: str, a: str, b: str) -> str:
+    """legacy_key() from an ISO date and already-normalized names."""
+    return f"{iso}|{a}|{b}" if a <= b else f"{iso}|{b}|{a}"
 
 # ---------- HTTP / scraping helpers ----------
 
-def get_event_links():
-    url = "http://www.ufcstats.com/statistics/events/completed?page=all"
-    r = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, 'html.parser')
-    return [a['href'] for a in soup.select('.b-statistics__table-events a[href*="/event-details/"]')]
+_fetch_sem: Optional[asyncio.Semaphore] = None  # created in main() on the running loop
+_parse_pool: Optional[ProcessPoolExecutor] = None  # created in main(); without it pages parse inline
 
-def split_stat(td):
-    """FIXED: Get stats from individual <p> tags, not combined text"""
-    try:
-        # Each td has 2 <p> tags: one for fighter 1, one for fighter 2
-        p_tags = td.find_all('p')
-        if len(p_tags) >= 2:
-            val1 = p_tags[0].text.strip()
-            val2 = p_tags[1].text.strip()
-            # Extract just the first number from "X of Y" format
-            match1 = re.match(r'(\d+)', val1)
-            match2 = re.match(r'(\d+)', val2)
-            return (match1.group(1) if match1 else "0", match2.group(1) if match2 else "0")
-        if len(p_tags) == 1:
-            val = p_tags[0].text.strip()
-            match = re.match(r'(\d+)', val)
-            num = match.group(1) if match else "0"
-            return num, num
-        return "0", "0"
-    except Exception:
-        return "0", "0"
+# Page bodies are fed to lxml as bytes; UFCStats serves UTF-8, and without an
+# explicit encoding libxml2 would guess latin-1 for pages lacking a <meta charset>.
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+class TokenBucket:
+    """
+    Async token bucket: tokens refill at `rate` per second up to `capacity`,
+    and each request spends one. Bursts go straight through; callers only
+    wait once the budget is used up.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host, so the courtesy budget for one site never
+    delays requests to another. www.host and host count as the same site.
+    """
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        host = (urlparse(url).hostname or '').removeprefix('www.')
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate)
+        await bucket.acquire()
+
+_rate_limit: Optional[HostRateLimiter] = None  # created in main(); paces every GET per host
+
+# Event links on the completed-events listing and the date span after each one,
+# matched straight off the HTML; the date is optional and never taken from a later row
+_EVENT_HREF = re.compile(
+    r'href="(https?://(?:www\.)?ufcstats\.com/event-details/[a-f0-9]+)"'
+    r'(?:(?:(?!</tr>|event-details/).)*?<span class="b-statistics__date">\s*([^<]*?)\s*</span>)?',
+    re.S)
+
+async def get_event_links(session: aiohttp.ClientSession) -> List[Tuple[str, Optional[date]]]:
+    """(event URL, listed date) for every event on the listing, newest first."""
+    url = "http://www.ufcstats.com/statistics/events/completed?page=all"
+    await _rate_limit.acquire(url)
+    async with session.get(url) as r:
+        r.raise_for_status()
+        text = await r.text()
+    # No DOM needed just to collect hrefs; the dict dedupes links, keeping
+    # page order and the first date found for each
+    links: Dict[str, str] = {}
+    for link, date_str in _EVENT_HREF.findall(text):
+        if not links.get(link):
+            links[link] = date_str
+    return [(link, parse_date_to_obj(date_str)) for link, date_str in links.items()]
+
+def events_through_cutoff(events: List[Tuple[str, Optional[date]]], max_date: date, inclusive: bool) -> int:
+    """
+    Length of the leading run of events (newest first) dated after max_date,
+    or on it when inclusive, using the listing's own dates. An undated event
+    ends the run, as an unreadable event page always has.
+    """
+    n = next((i for i, (_, d) in enumerate(events) if d is None), len(events))
+    # Newest first means descending dates; negated ordinals ascend for bisect
+    keys = [-d.toordinal() for _, d in events[:n]]
+    cut = -max_date.toordinal()
+    return bisect.bisect_right(keys, cut) if inclusive else bisect.bisect_left(keys, cut)
 
-def scrape_career_stats(soup):
+def split_stat_values(vals: List[str]) -> Tuple[str, str]:
+    """
+    Leading numbers of a stat cell's <p> texts as (fighter 1, fighter 2); each
+    td has one <p> per fighter. "X of Y" keeps X; a missing value is "0".
+    """
+    if len(vals) >= 2:
+        # Extract just the first number from "X of Y" format
+        match1 = _LEAD_DIGITS.match(vals[0])
+        match2 = _LEAD_DIGITS.match(vals[1])
+        return (match1.group(1) if match1 else "0", match2.group(1) if match2 else "0")
+    if len(vals) == 1:
+        match = _LEAD_DIGITS.match(vals[0])
+        num = match.group(1) if match else "0"
+        return num, num
+    return "0", "0"
+
+def _has_class(cls: str) -> str:
+    """XPath test for a CSS class token, i.e. what the selector '.cls' matches."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {cls} ")'
+
+# Fighter page lookups, compiled once
+_RECORD = etree.XPath(f'(//*[{_has_class("b-content__title-record")}])[1]')
+_BIO_BOX = etree.XPath(f'(//*[{_has_class("b-list__info-box")}])[1]')
+_BIO_ITEMS = etree.XPath(f'.//*[{_has_class("b-list__box-list")}]//li')
+_CAREER_ITEMS = etree.XPath(f'//*[{_has_class("b-list__box-list")} and {_has_class("b-list__box-list_margin-top")}]//li')
+_FIRST_I = etree.XPath('(.//i)[1]')
+
+def scrape_career_stats(tree):
     stats = {k:'Unknown' for k in [
         'SLpM','Str_Acc','SApM','Str_Def','TD_Avg','TD_Acc','TD_Def','Sub_Avg'
     ]}
@@ -114,397 +312,546 @@ def scrape_career_stats(soup):
         'SLpM:':'SLpM','Str. Acc.:':'Str_Acc','SApM:':'SApM','Str. Def:':'Str_Def',
         'TD Avg.:':'TD_Avg','TD Acc.:':'TD_Acc','TD Def.:':'TD_Def','Sub. Avg.:':'Sub_Avg'
     }
-    for li in soup.select('.b-list__box-list.b-list__box-list_margin-top li'):
-        it = li.find('i')
-        if not it: continue
-        key = labels.get(it.text.strip())
+    for li in _CAREER_ITEMS(tree):
+        it = next(iter(_FIRST_I(li)), None)
+        if it is None: continue
+        it_text = it.text_content()
+        key = labels.get(it_text.strip())
         if key:
-            stats[key] = li.text.replace(it.text, '').strip().lstrip(':').strip()
+            stats[key] = li.text_content().replace(it_text, '').strip().lstrip(':').strip()
     return stats
 
-def fetch_with_retries(url: str, tries: int = 3, delay: float = 1.0) -> Optional[requests.Response]:
+@contextmanager
+def replaced_atomically(path: str):
+    """Yield a temp path to write; it is renamed over path afterwards, so readers never see half a file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    yield tmp
+    os.replace(tmp, path)
+
+def _html_cache_path(url: str) -> str:
+    return os.path.join(HTML_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest()[:16] + '.html.gz')
+
+def read_html_cache(url: str) -> Optional[bytes]:
+    """Body of url from HTML_CACHE_DIR if a copy younger than HTML_CACHE_TTL is there, else None."""
+    if not HTML_CACHE_DIR or UPDATE_EXISTING:
+        return None  # a refresh run must see the live pages
+    path = _html_cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) > HTML_CACHE_TTL.total_seconds():
+            return None
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    except Exception:
+        return None  # missing or unreadable: fetch it
+
+def write_html_cache(url: str, body: bytes) -> None:
+    if not HTML_CACHE_DIR:
+        return
+    try:
+        os.makedirs(HTML_CACHE_DIR, exist_ok=True)
+        with replaced_atomically(_html_cache_path(url)) as tmp, gzip.open(tmp, 'wb', compresslevel=5) as f:
+            f.write(body)
+    except OSError as e:
+        log.warning("    !! Could not cache %s: %s", url, e)
+
+async def fetch(session: aiohttp.ClientSession, url: str, tries: int = 3) -> Optional[bytes]:
+    """
+    GET url and return the raw body bytes, or None once retries are exhausted.
+    Decoding is left to lxml (see _HTML_PARSER), which is faster than aiohttp's
+    charset sniffing in r.text().
+    Like urllib3's Retry: network errors and RETRY_STATUSES are retried with
+    exponential backoff; any other HTTP error (404, ...) fails immediately.
+    """
     for attempt in range(1, tries+1):
         try:
-            r = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            r.raise_for_status()
-            return r
+            async with _fetch_sem:
+                await _rate_limit.acquire(url)
+                async with session.get(url) as r:
+                    r.raise_for_status()
+                    return await r.read()
         except Exception as e:
-            if attempt == tries:
-                print(f"    !! Failed GET {url}: {e}")
+            retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+            if attempt == tries or not retryable:
+                log.warning("    !! Failed GET %s: %s", url, e)
                 return None
-            time.sleep(delay)
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+def _parse_page(parse, html: bytes) -> Tuple[dict, bool]:
+    """parse() of html's page_tree(), and whether html held a document at all."""
+    tree = page_tree(html)
+    return parse(tree), tree is not None
+
+async def parse_in_pool(parse, html: bytes) -> Tuple[dict, bool]:
+    """Run a pure page parser in _parse_pool so parsing uses every core while fetches continue."""
+    if _parse_pool is None:
+        return _parse_page(parse, html)
+    return await asyncio.get_running_loop().run_in_executor(_parse_pool, _parse_page, parse, html)
+
+async def fetch_page(session: aiohttp.ClientSession, url: str, parse) -> Optional[dict]:
+    """
+    parse() of url's page, or None if the GET failed. A copy in HTML_CACHE_DIR
+    skips the network; a fetched body is cached only once it parsed, so an
+    empty or broken response is never replayed from the cache.
+    """
+    body = read_html_cache(url)
+    cached = body is not None
+    if not cached:
+        body = await fetch(session, url)
+        if body is None:
+            return None
+    result, parsed = await parse_in_pool(parse, body)
+    if parsed and not cached:
+        write_html_cache(url, body)
+    return result
+
+async def scrape_fighter_details(session: aiohttp.ClientSession, url) -> dict:
+    info = await fetch_page(session, url, _parse_fighter_page)
+    return info if info is not None else _parse_fighter_page(None)
+
+def page_tree(html: bytes) -> Optional[lxml.html.HtmlElement]:
+    """
+    lxml tree of a page body, or None when it holds no element at all (blank,
+    comment-only, a bare <?xml?>), which bs4 parsed as an empty page.
+    """
+    if not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html, parser=_HTML_PARSER)
+    except etree.ParserError:
+        return None  # "Document is empty"; the error would not pickle back from _parse_pool
 
-def scrape_fighter_details(url) -> dict:
-    r = fetch_with_retries(url)
-    if r is None:
+def _parse_fighter_page(tree: Optional[lxml.html.HtmlElement]) -> dict:
+    if tree is None:
         return { 'record':'Unknown','height':'Unknown','weight':'Unknown','reach':'Unknown',
                  'stance':'Unknown','dob':'Unknown','SLpM':'Unknown','Str_Acc':'Unknown',
                  'SApM':'Unknown','Str_Def':'Unknown','TD_Avg':'Unknown','TD_Acc':'Unknown',
                  'TD_Def':'Unknown','Sub_Avg':'Unknown' }
 
-    soup = BeautifulSoup(r.text, 'html.parser')
     info = { 'record':'Unknown','height':'Unknown','weight':'Unknown',
              'reach':'Unknown','stance':'Unknown','dob':'Unknown' }
 
-    rec = soup.select_one('.b-content__title-record')
-    if rec: info['record'] = rec.text.replace('Record:', '').strip()
-
-    bio = soup.select_one('.b-list__info-box')
-    if bio:
-        for li in bio.select('.b-list__box-list li'):
-            it = li.select_one('i')
-            if not it: continue
-            label = it.text.strip().lower()
-            value = li.text.replace(it.text, '').replace(':','').strip()
+    rec = next(iter(_RECORD(tree)), None)
+    if rec is not None: info['record'] = rec.text_content().replace('Record:', '').strip()
+
+    bio = next(iter(_BIO_BOX(tree)), None)
+    if bio is not None:
+        for li in _BIO_ITEMS(bio):
+            it = next(iter(_FIRST_I(li)), None)
+            if it is None: continue
+            it_text = it.text_content()
+            label = it_text.strip().lower()
+            value = li.text_content().replace(it_text, '').replace(':','').strip()
             if   'height' in label: info['height'] = value
             elif 'weight' in label: info['weight'] = value
             elif 'reach'  in label: info['reach']  = value
             elif 'stance' in label: info['stance'] = value
             elif 'dob'    in label: info['dob']    = value
 
-    return {**info, **scrape_career_stats(soup)}
+    return {**info, **scrape_career_stats(tree)}
+
+_fighter_cache: Dict[str, asyncio.Task] = {}  # fighter URL -> scrape task, shared for the whole run
 
-def scrape_fight_details(fight_url: str) -> dict:
+async def get_fighter_details(session: aiohttp.ClientSession, url) -> dict:
+    """
+    scrape_fighter_details, memoized per URL: a fighter on several bouts is
+    fetched once, and concurrent callers await the same in-flight task.
+    """
+    # Links to the same fighter can differ by a querystring or fragment; key on the bare page
+    url = url.split('#', 1)[0].split('?', 1)[0]
+    task = _fighter_cache.get(url)
+    if task is None:
+        task = _fighter_cache[url] = asyncio.ensure_future(scrape_fighter_details(session, url))
+    return await task
+
+# Compiled once; used by scrape_fight_details on every fight page.
+_FIGHT_SECTIONS = etree.XPath(f'//section[{_has_class("b-fight-details__section")}]')
+_SECTION_HEADING = etree.XPath(f'string((.//p[{_has_class("b-fight-details__collapse-link_tot")}])[1])')
+_NEXT_TABLE = etree.XPath('(.//table | following::table)[1]')  # same as bs4 find_next('table')
+_STATS_ROWS = etree.XPath('(.//tbody)[1]//tr[not(contains(string((.//th)[1]), "Round"))]')
+_ROW_CELLS = etree.XPath('.//td')
+_ROW_PS = etree.XPath('.//td/p')
+
+def row_cell_texts(row, cols) -> List[List[str]]:
+    """
+    Stripped <p> texts of each cell in a stats row (fighter 1 first, then
+    fighter 2), gathered with one XPath call over the row instead of one per cell.
+    """
+    texts = [[] for _ in cols]
+    pos = {td: i for i, td in enumerate(cols)}
+    for p in _ROW_PS(row):
+        texts[pos[p.getparent()]].append(p.text_content().strip())
+    return texts
+
+# "X of Y" columns: (column index, CSV key prefix)
+TOTALS_X_OF_Y = [(2, 'sig_str'), (4, 'total_str'), (5, 'td')]
+SIG_X_OF_Y = [(3, 'head'), (4, 'body'), (5, 'leg'), (6, 'distance'), (7, 'clinch'), (8, 'ground')]
+
+def _x_of_y_keys(spec: List[Tuple[int, str]]) -> List[Tuple[int, str, str, str, str]]:
+    """Expand (column, prefix) specs into (column, f1 landed, f1 attempted, f2 landed, f2 attempted) keys."""
+    return [(col, f'f1_{p}_landed', f'f1_{p}_attempted', f'f2_{p}_landed', f'f2_{p}_attempted')
+            for col, p in spec]
+
+# The table schemas are fixed, so the stats keys are formatted once here, not per fight
+_TOTALS_KEYS = _x_of_y_keys(TOTALS_X_OF_Y)
+_SIG_KEYS = _x_of_y_keys(SIG_X_OF_Y)
+
+# Fight-page stats a stored row must have for an UPDATE_EXISTING run to skip re-scraping it
+TARGET_DETAIL_FIELDS = tuple(k for keys in _TOTALS_KEYS + _SIG_KEYS for k in keys[1:])
+
+def _pull_x_of_y(p_texts: List[str], keys: Tuple[int, str, str, str, str], stats: dict) -> None:
+    """Store f1/f2 landed and attempted from an "X of Y" cell ('0' if unparseable); keys from _x_of_y_keys."""
+    if len(p_texts) < 2:
+        return
+    _, f1_landed, f1_attempted, f2_landed, f2_attempted = keys
+    m = _X_OF_Y.match(p_texts[0])
+    stats[f1_landed], stats[f1_attempted] = m.groups() if m else ('0', '0')
+    m = _X_OF_Y.match(p_texts[1])
+    stats[f2_landed], stats[f2_attempted] = m.groups() if m else ('0', '0')
+
+async def scrape_fight_details(session: aiohttp.ClientSession, fight_url: str) -> dict:
     """NEW: Scrape detailed stats from individual fight page (totals only)"""
-    r = fetch_with_retries(fight_url)
-    if r is None:
+    return await fetch_page(session, fight_url, _parse_fight_page) or {}
+
+def _parse_fight_page(tree: Optional[lxml.html.HtmlElement]) -> dict:
+    if tree is None:
         return {}
     
-    soup = BeautifulSoup(r.text, 'html.parser')
     stats = {}
     
     # Find the "Totals" section (not per-round)
-    sections = soup.find_all('section', class_='b-fight-details__section')
-    
     totals_table = None
     sig_strikes_table = None
     
-    for i, section in enumerate(sections):
+    for section in _FIGHT_SECTIONS(tree):
         # Look for "Totals" heading
-        heading = section.find('p', class_='b-fight-details__collapse-link_tot')
-        if heading:
-            heading_text = heading.text.strip()
-            
-            # First "Totals" = main stats table
-            if 'Totals' in heading_text and not totals_table:
-                # Get the next table after this section
-                totals_table = section.find_next('table')
-            
-            # "Significant Strikes" heading = detailed strikes table
-            elif 'Significant Strikes' in heading_text and not sig_strikes_table:
-                sig_strikes_table = section.find_next('table')
+        heading_text = _SECTION_HEADING(section).strip()
+        
+        # First "Totals" = main stats table
+        if 'Totals' in heading_text and totals_table is None:
+            # Get the next table after this section
+            totals_table = next(iter(_NEXT_TABLE(section)), None)
+        
+        # "Significant Strikes" heading = detailed strikes table
+        elif 'Significant Strikes' in heading_text and sig_strikes_table is None:
+            sig_strikes_table = next(iter(_NEXT_TABLE(section)), None)
     
     # Extract from totals table (KD, Sig Str, TD, Sub, etc.)
-    if totals_table:
-        tbody = totals_table.find('tbody')
-        if tbody:
-            rows = tbody.find_all('tr')
-            # Skip rows with "Round" headers, get only the totals row
-            for row in rows:
-                # Skip round header rows
-                th = row.find('th')
-                if th and 'Round' in th.text:
-                    continue
+    if totals_table is not None:
+        # Skip rows with "Round" headers, get only the totals row
+        for row in _STATS_ROWS(totals_table):
+            cols = _ROW_CELLS(row)
+            if len(cols) >= 10:
+                cells = row_cell_texts(row, cols)
+                # This is the totals row!
+                # Columns: 0=fighters, 1=KD, 2=Sig.str, 3=Sig.str%, 4=Total.str, 5=Td, 6=Td%, 7=Sub, 8=Rev, 9=Ctrl
+                
+                stats['f1_total_kd'], stats['f2_total_kd'] = split_stat_values(cells[1])
+                
+                # Sig str, Total str, TD - need landed AND attempted
+                for keys in _TOTALS_KEYS:
+                    _pull_x_of_y(cells[keys[0]], keys, stats)
+                
+                # Sig str % and TD %
+                for col, key in ((3, 'sig_str_pct'), (6, 'td_pct')):
+                    p_texts = cells[col]
+                    if len(p_texts) >= 2:
+                        f1_pct = p_texts[0].replace('%', '')
+                        f2_pct = p_texts[1].replace('%', '')
+                        stats[f'f1_{key}'] = f1_pct if f1_pct != '---' else '0'
+                        stats[f'f2_{key}'] = f2_pct if f2_pct != '---' else '0'
+                
+                # Sub att, Reversals
+                stats['f1_sub_att'], stats['f2_sub_att'] = split_stat_values(cells[7])
+                stats['f1_reversals'], stats['f2_reversals'] = split_stat_values(cells[8])
                 
-                cols = row.find_all('td')
-                if len(cols) >= 10:
-                    # This is the totals row!
-                    # Columns: 0=fighters, 1=KD, 2=Sig.str, 3=Sig.str%, 4=Total.str, 5=Td, 6=Td%, 7=Sub, 8=Rev, 9=Ctrl
-                    
-                    f1_kd, f2_kd = split_stat(cols[1])
-                    stats['f1_total_kd'] = f1_kd
-                    stats['f2_total_kd'] = f2_kd
-                    
-                    # Sig str - need landed AND attempted
-                    p_tags = cols[2].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_sig = p_tags[0].text.strip()
-                        f2_sig = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_sig)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_sig)
-                        
-                        stats['f1_sig_str_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_sig_str_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_sig_str_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_sig_str_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # Sig str %
-                    p_tags = cols[3].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_pct = p_tags[0].text.strip().replace('%', '')
-                        f2_pct = p_tags[1].text.strip().replace('%', '')
-                        stats['f1_sig_str_pct'] = f1_pct if f1_pct != '---' else '0'
-                        stats['f2_sig_str_pct'] = f2_pct if f2_pct != '---' else '0'
-                    
-                    # Total str
-                    p_tags = cols[4].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_total = p_tags[0].text.strip()
-                        f2_total = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_total)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_total)
-                        
-                        stats['f1_total_str_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_total_str_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_total_str_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_total_str_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # TD
-                    p_tags = cols[5].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_td = p_tags[0].text.strip()
-                        f2_td = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_td)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_td)
-                        
-                        stats['f1_td_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_td_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_td_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_td_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # TD %
-                    p_tags = cols[6].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_td_pct = p_tags[0].text.strip().replace('%', '')
-                        f2_td_pct = p_tags[1].text.strip().replace('%', '')
-                        stats['f1_td_pct'] = f1_td_pct if f1_td_pct != '---' else '0'
-                        stats['f2_td_pct'] = f2_td_pct if f2_td_pct != '---' else '0'
-                    
-                    # Sub att
-                    f1_sub, f2_sub = split_stat(cols[7])
-                    stats['f1_sub_att'] = f1_sub
-                    stats['f2_sub_att'] = f2_sub
-                    
-                    # Reversals
-                    f1_rev, f2_rev = split_stat(cols[8])
-                    stats['f1_reversals'] = f1_rev
-                    stats['f2_reversals'] = f2_rev
-                    
-                    # Control time
-                    p_tags = cols[9].find_all('p')
-                    if len(p_tags) >= 2:
-                        stats['f1_ctrl_time'] = p_tags[0].text.strip()
-                        stats['f2_ctrl_time'] = p_tags[1].text.strip()
-                    
-                    break  # Found totals row, exit loop
+                # Control time
+                p_texts = cells[9]
+                if len(p_texts) >= 2:
+                    stats['f1_ctrl_time'] = p_texts[0]
+                    stats['f2_ctrl_time'] = p_texts[1]
+                
+                break  # Found totals row, exit loop
     
     # Extract from significant strikes detail table (Head, Body, Leg, etc.)
-    if sig_strikes_table:
-        tbody = sig_strikes_table.find('tbody')
-        if tbody:
-            rows = tbody.find_all('tr')
-            # Again, skip round headers
-            for row in rows:
-                th = row.find('th')
-                if th and 'Round' in th.text:
-                    continue
+    if sig_strikes_table is not None:
+        # Again, skip round headers
+        for row in _STATS_ROWS(sig_strikes_table):
+            cols = _ROW_CELLS(row)
+            if len(cols) >= 9:
+                cells = row_cell_texts(row, cols)
+                # Columns: 0=fighters, 1=sig.str, 2=sig.str%, 3=head, 4=body, 5=leg, 6=distance, 7=clinch, 8=ground
+                
+                for keys in _SIG_KEYS:
+                    _pull_x_of_y(cells[keys[0]], keys, stats)
                 
-                cols = row.find_all('td')
-                if len(cols) >= 9:
-                    # Columns: 0=fighters, 1=sig.str, 2=sig.str%, 3=head, 4=body, 5=leg, 6=distance, 7=clinch, 8=ground
-                    
-                    # Head
-                    p_tags = cols[3].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_head = p_tags[0].text.strip()
-                        f2_head = p_tags[1].text.strip()
-                        
-                        # Parse "X of Y" format - extract BOTH numbers
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_head)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_head)
-                        
-                        if f1_match:
-                            stats['f1_head_landed'] = f1_match.group(1)      # Just the landed (5)
-                            stats['f1_head_attempted'] = f1_match.group(2)   # Just the attempted (24)
-                        else:
-                            stats['f1_head_landed'] = '0'
-                            stats['f1_head_attempted'] = '0'
-                        
-                        if f2_match:
-                            stats['f2_head_landed'] = f2_match.group(1)      # Just the landed
-                            stats['f2_head_attempted'] = f2_match.group(2)   # Just the attempted
-                        else:
-                            stats['f2_head_landed'] = '0'
-                            stats['f2_head_attempted'] = '0'
-                    else:
-                        stats['f1_head_landed'] = '0'
-                        stats['f1_head_attempted'] = '0'
-                        stats['f2_head_landed'] = '0'
-                        stats['f2_head_attempted'] = '0'
-                    
-                    # Body
-                    p_tags = cols[4].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_body = p_tags[0].text.strip()
-                        f2_body = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_body)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_body)
-                        
-                        stats['f1_body_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_body_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_body_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_body_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # Leg
-                    p_tags = cols[5].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_leg = p_tags[0].text.strip()
-                        f2_leg = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_leg)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_leg)
-                        
-                        stats['f1_leg_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_leg_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_leg_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_leg_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # Distance
-                    p_tags = cols[6].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_dist = p_tags[0].text.strip()
-                        f2_dist = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_dist)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_dist)
-                        
-                        stats['f1_distance_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_distance_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_distance_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_distance_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # Clinch
-                    p_tags = cols[7].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_clinch = p_tags[0].text.strip()
-                        f2_clinch = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_clinch)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_clinch)
-                        
-                        stats['f1_clinch_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_clinch_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_clinch_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_clinch_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    # Ground
-                    p_tags = cols[8].find_all('p')
-                    if len(p_tags) >= 2:
-                        f1_ground = p_tags[0].text.strip()
-                        f2_ground = p_tags[1].text.strip()
-                        
-                        f1_match = re.match(r'(\d+)\s+of\s+(\d+)', f1_ground)
-                        f2_match = re.match(r'(\d+)\s+of\s+(\d+)', f2_ground)
-                        
-                        stats['f1_ground_landed'] = f1_match.group(1) if f1_match else '0'
-                        stats['f1_ground_attempted'] = f1_match.group(2) if f1_match else '0'
-                        stats['f2_ground_landed'] = f2_match.group(1) if f2_match else '0'
-                        stats['f2_ground_attempted'] = f2_match.group(2) if f2_match else '0'
-                    
-                    break  # Found totals row, exit loop
+                # Head is always reported, as zeros when the cell is missing
+                for key in ('f1_head_landed', 'f1_head_attempted', 'f2_head_landed', 'f2_head_attempted'):
+                    stats.setdefault(key, '0')
+                
+                break  # Found totals row, exit loop
     
     return stats
 
-def extract_event_meta(event_url) -> Tuple[BeautifulSoup, Optional[date], str, str]:
-    r = fetch_with_retries(event_url)
-    if r is None:
-        return BeautifulSoup("", 'html.parser'), None, "", ""
-    soup = BeautifulSoup(r.text, 'html.parser')
-    details = soup.find('div', class_='b-fight-details')
-    lis = details.find_all('li') if details else []
-    date_str = lis[0].text.strip().replace("Date:", "").strip() if lis else "Unknown"
-    loc_str  = lis[1].text.strip().replace("Location:", "").strip() if len(lis) > 1 else "Unknown"
-    d_obj = parse_date_to_obj(date_str)
-    return soup, d_obj, date_str, loc_str
+# Event page lookups, compiled once
+_EVENT_INFO_ITEMS = etree.XPath(f'(//div[{_has_class("b-fight-details")}])[1]//li')
+_FIGHT_TABLE = etree.XPath(f'(//table[{_has_class("b-fight-details__table")}])[1]')
+_TABLE_ROWS = etree.XPath('.//tr')
+_LINKS = etree.XPath('.//a')
+_FIGHT_HREF = etree.XPath('.//a[contains(@href, "/fight-details/")]/@href')
+
+async def extract_event_meta(session: aiohttp.ClientSession, event_url) -> Tuple[Optional[list], Optional[date], str, str]:
+    """
+    Fetch an event page and parse it in _parse_pool. Returns (fights, date,
+    date text, location); fights is _parse_event_page()'s list for parse_card.
+    """
+    page = await fetch_page(session, event_url, _parse_event_page)
+    if page is None:
+        return None, None, "", ""
+    return page['fights'], parse_date_to_obj(page['date']), page['date'], page['location']
+
+def _parse_event_page(tree: Optional[lxml.html.HtmlElement]) -> dict:
+    """
+    Date, location and fight-table rows of an event page, as plain values so
+    the result pickles back from _parse_pool. Each fight is (f1_name, f2_name,
+    scraped columns, f1_href, f2_href, fight_url); fights is None without a table.
+    """
+    if tree is None:
+        return {'date': 'Unknown', 'location': 'Unknown', 'fights': None}
+    lis = _EVENT_INFO_ITEMS(tree)
+    date_str = lis[0].text_content().strip().replace("Date:", "").strip() if lis else "Unknown"
+    loc_str  = lis[1].text_content().strip().replace("Location:", "").strip() if len(lis) > 1 else "Unknown"
+
+    table = next(iter(_FIGHT_TABLE(tree)), None)
+    if table is None:
+        return {'date': date_str, 'location': loc_str, 'fights': None}
+
+    fights = []
+    for row in _TABLE_ROWS(table)[1:]:
+        cols = _ROW_CELLS(row)
+        if len(cols) < 10:
+            continue
+
+        # Get fighter names and their detail links
+        fighter_links = _LINKS(cols[1])
+        if len(fighter_links) < 2:
+            continue
+        f1_tag, f2_tag = fighter_links[0], fighter_links[1]
+
+        # Every cell's <p> texts in one pass over the row
+        cells = row_cell_texts(row, cols)
+        method_ps = cells[7]
+        fields = {
+            'result': cols[0].text_content().strip(),
+            'method_main': method_ps[0] if method_ps else "",
+            'method_detail': method_ps[1] if len(method_ps) > 1 else "",
+            'round': cols[8].text_content().strip(),
+            'time': cols[9].text_content().strip(),
+        }
+        fields['fighter_1_kd'], fields['fighter_2_kd'] = split_stat_values(cells[2])
+        fields['fighter_1_str'], fields['fighter_2_str'] = split_stat_values(cells[3])
+        fields['fighter_1_td'], fields['fighter_2_td'] = split_stat_values(cells[4])
+        fields['fighter_1_sub'], fields['fighter_2_sub'] = split_stat_values(cells[5])
+        fields['weight_class'] = ' '.join(cols[6].text_content().split())
+
+        # Fight details page: UFCStats rows carry it in data-link; fall back to
+        # a /fight-details/ anchor in the row for markup without the attribute
+        fight_url = row.get('data-link') or next(map(str, _FIGHT_HREF(row)), None)
+
+        fights.append((f1_tag.text_content().strip(), f2_tag.text_content().strip(), fields,
+                       f1_tag.get('href', ''), f2_tag.get('href', ''), fight_url))
+    return {'date': date_str, 'location': loc_str, 'fights': fights}
+
+# Blank copy of every priority column; parse_card starts each scraped row from it
+_ROW_TEMPLATE = dict.fromkeys(FIELDNAMES_PRIORITY, '')
+
+def row_is_complete(row: dict) -> bool:
+    """True if a stored row already has every TARGET_DETAIL_FIELDS value."""
+    return all(not is_blank(row.get(f)) for f in TARGET_DETAIL_FIELDS)
+
+def parse_card(fights: Optional[list], event_date_str: str, event_loc: str,
+               seen_keys: set, key_to_row: Dict[str, dict]) -> Optional[Tuple[list, int]]:
+    """
+    Rows of an event's fight table as (key, rowdict, f1_href, f2_href, fight_url),
+    plus how many rows were skipped as complete. Fights in seen_keys are left
+    out, unless UPDATE_EXISTING and their key_to_row entry is still missing
+    fight-page stats (see row_is_complete). None if the page has no table.
+    """
+    if fights is None:
+        return None
+
+    pending = []
+    complete = 0
+    for f1_name, f2_name, fields, f1_href, f2_href, fight_url in fights:
+        k = legacy_key(event_date_str, f1_name, f2_name)
+        # Skip heavy requests if already in CSV and not refreshing, or if
+        # refreshing but the stored row has nothing left to fill in
+        if k in seen_keys:
+            existing = key_to_row.get(k)
+            if not UPDATE_EXISTING or existing is None:
+                continue  # existing is None: scraped earlier this run
+            if row_is_complete(existing):
+                complete += 1
+                continue
+
+        # Every row starts with the full column set, so writers never fill gaps
+        rowdict = _ROW_TEMPLATE.copy()
+        rowdict['event_date'] = event_date_str
+        rowdict['event_location'] = event_loc
+        rowdict['fighter_1'] = f1_name
+        rowdict['fighter_2'] = f2_name
+        rowdict.update(fields)
+        pending.append((k, rowdict, f1_href, f2_href, fight_url))
+    return pending, complete
+
+async def process_row(session: aiohttp.ClientSession, rowdict: dict, f1_href: str, f2_href: str,
+                      fight_url: Optional[str]) -> Tuple[dict, Optional[dict]]:
+    """
+    Complete one parse_card() row: both fighters' pages and the fight page are
+    fetched concurrently and merged into rowdict. Returns (rowdict, fight
+    details), with None for the details when the row has no fight_url.
+    """
+    jobs = [get_fighter_details(session, f1_href), get_fighter_details(session, f2_href)]
+    if fight_url:
+        jobs.append(scrape_fight_details(session, fight_url))
+    f1_stats, f2_stats, *fight = await asyncio.gather(*jobs)
+    fight_details = fight[0] if fight else None
+
+    rowdict.update({
+        'fighter_1_record': f"'{f1_stats['record']}",
+        'fighter_1_height': f1_stats['height'],
+        'fighter_1_weight': f1_stats['weight'],
+        'fighter_1_reach': f1_stats['reach'],
+        'fighter_1_stance': f1_stats['stance'],
+        'fighter_1_dob': f1_stats['dob'],
+        'fighter_2_record': f"'{f2_stats['record']}",
+        'fighter_2_height': f2_stats['height'],
+        'fighter_2_weight': f2_stats['weight'],
+        'fighter_2_reach': f2_stats['reach'],
+        'fighter_2_stance': f2_stats['stance'],
+        'fighter_2_dob': f2_stats['dob'],
+    })
+
+    # Map career stats to your lowercase schema
+    rowdict.update(map_stats('fighter_1', f1_stats))
+    rowdict.update(map_stats('fighter_2', f2_stats))
+
+    # Add detailed fight stats
+    rowdict.update(fight_details or {})
+    return rowdict, fight_details
+
+async def fetch_card(session: aiohttp.ClientSession, pending: list) -> list:
+    """process_row() for every row of a parse_card() list at once; a failed row yields its exception."""
+    return await asyncio.gather(*[process_row(session, *row[1:]) for row in pending],
+                                return_exceptions=True)
 
 # ---------- CSV helpers ----------
 
+# UFCStats career-stat key -> CSV column suffix
+CAREER_STAT_COLUMNS = {
+    "SLpM":    "slpm",
+    "Str_Acc": "str_acc",
+    "SApM":    "sapm",
+    "Str_Def": "str_def",
+    "TD_Avg":  "td_avg",
+    "TD_Acc":  "td_acc",
+    "TD_Def":  "td_def",
+    "Sub_Avg": "sub_avg",
+}
+# Full column names per side, built once rather than formatted for every fight
+F1_MAP = {src: f"fighter_1_{col}" for src, col in CAREER_STAT_COLUMNS.items()}
+F2_MAP = {src: f"fighter_2_{col}" for src, col in CAREER_STAT_COLUMNS.items()}
+_STAT_MAPS = {'fighter_1': F1_MAP, 'fighter_2': F2_MAP}
+
 def map_stats(prefix: str, stats: dict) -> dict:
     """Map UFCStats keys to your CSV's lower_snake_case columns."""
-    return {
-        f"{prefix}_slpm":     stats.get("SLpM", "Unknown"),
-        f"{prefix}_str_acc":  stats.get("Str_Acc", "Unknown"),
-        f"{prefix}_sapm":     stats.get("SApM", "Unknown"),
-        f"{prefix}_str_def":  stats.get("Str_Def", "Unknown"),
-        f"{prefix}_td_avg":   stats.get("TD_Avg", "Unknown"),
-        f"{prefix}_td_acc":   stats.get("TD_Acc", "Unknown"),
-        f"{prefix}_td_def":   stats.get("TD_Def", "Unknown"),
-        f"{prefix}_sub_avg":  stats.get("Sub_Avg", "Unknown"),
-    }
+    return {dst: stats.get(src, "Unknown") for src, dst in _STAT_MAPS[prefix].items()}
 
-def merge_rows(old_row, new_row):
-    merged = dict(old_row) if old_row else {}
+def merge_rows(old_row, new_row) -> Tuple[dict, bool]:
+    """
+    new_row's values laid over old_row, plus whether any column changed, so
+    callers need not compare the whole dicts to find out.
+    """
+    # Hidden helper keys (row_date/row_names caches) are dropped and rebuilt
+    # on demand, since the merge may change the fighter order
+    merged = {k: v for k, v in old_row.items() if not k.startswith(_HIDDEN)} if old_row else {}
+    changed = False
     for k, v in new_row.items():
-        if v is None: continue
+        if v is None or k.startswith(_HIDDEN): continue
         sv = str(v).strip()
+        if not sv and k not in merged:
+            continue  # a blank template column adds nothing
         if (not sv) or (sv.lower() == 'unknown'):
             if k in merged and str(merged[k]).strip():
                 continue
-        merged[k] = sv
-    return merged
+        if k not in merged or merged[k] != sv:
+            merged[k] = sv
+            changed = True
+    return merged, changed
 
 def load_existing_csv(csv_path):
-    """Read CSV, normalize headers, build {iso|f1|f2 -> row}, find max date."""
+    """
+    Read CSV, normalize headers, build {iso|f1|f2 -> row}, find max date.
+    Also returns the encoding the file was read with (None if there is no file).
+    """
     rows, key_to_row, headers = [], {}, []
     if not os.path.exists(csv_path):
-        return rows, key_to_row, headers, None
+        return rows, key_to_row, headers, None, None
 
     def _read(enc):
         with open(csv_path, 'r', encoding=enc, newline='') as f:
             reader = csv.reader(f)
             raw_headers = next(reader, [])
             norm_headers = [norm_key(h) for h in raw_headers]
-            dict_rows = []
-            for raw in reader:
-                row = {}
-                for i, val in enumerate(raw):
-                    if i < len(norm_headers):
-                        row[norm_headers[i]] = val
-                dict_rows.append(row)
-            return dict_rows, norm_headers
+            # Headers are normalized once here; zip drops cells past the last header
+            return [dict(zip(norm_headers, raw)) for raw in reader], norm_headers
 
-    try:
-        rows, headers = _read('utf-8')
-    except UnicodeDecodeError:
-        for enc in ('cp1252', 'latin-1'):
-            try:
-                rows, headers = _read(enc); break
-            except UnicodeDecodeError:
-                continue
-        else:
-            raise
+    encoding = 'utf-8'  # the sidecar is only ever written next to a write_csv file
+    cached = read_csv_sidecar(csv_path)
+    if cached is not None:
+        rows, headers = cached
+    else:
+        try:
+            rows, headers = _read(encoding)
+        except UnicodeDecodeError:
+            for encoding in ('cp1252', 'latin-1'):
+                try:
+                    rows, headers = _read(encoding); break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                raise
 
     candidate_date_cols = ['event_date', 'date']
     date_col = next((c for c in candidate_date_cols if c in headers), None)
 
     max_date = None
     for r in rows:
-        r_norm = {norm_key(k): v for k, v in r.items()}
-        date_val = r_norm.get(date_col, '') if date_col else (r_norm.get('event_date', '') or r_norm.get('date', ''))
-        f1 = r_norm.get('fighter_1', '')
-        f2 = r_norm.get('fighter_2', '')
-        k = legacy_key(date_val, f1, f2)
-        key_to_row[k] = r  # keep row as loaded
+        # Row keys are already normalized, so read them directly
+        date_val = r.get(date_col, '') if date_col else ''
         d = parse_date_to_obj(date_val)
+        if date_col == 'event_date':
+            r[_DATE_OBJ] = d  # saves row_date() a lookup later
+        # row_names() caches the normalized names the enrichment passes reuse
+        key_to_row[legacy_key_fast(to_iso(d), *row_names(r))] = r  # keep row as loaded
         if d and (max_date is None or d > max_date):
             max_date = d
 
-    return rows, key_to_row, headers, max_date
+    return rows, key_to_row, headers, max_date, encoding
 
-def write_csv(csv_path, rows, headers_priority):
-    # Create directory if it doesn't exist
+def ensure_csv_dir(csv_path):
+    """Create csv_path's directory if it doesn't exist."""
     csv_dir = os.path.dirname(csv_path)
     if csv_dir and not os.path.exists(csv_dir):
         os.makedirs(csv_dir)
         print(f"Created directory: {csv_dir}")
+
+def write_csv(csv_path, rows, headers_priority) -> List[str]:
+    """Rewrite csv_path as UTF-8 with every column of rows, headers_priority first; returns the header."""
+    ensure_csv_dir(csv_path)
     
-    header_set = set()
-    for r in rows:
-        header_set.update(r.keys())
+    # Union the key sets in C first; hidden helper keys are dropped once
+    # from the union rather than tested on every row
+    header_set = {k for k in set().union(*rows) if not k.startswith(_HIDDEN)}
     seen = set()
     ordered = []
     for h in headers_priority:
@@ -514,11 +861,80 @@ def write_csv(csv_path, rows, headers_priority):
         if h not in seen:
             ordered.append(h); seen.add(h)
 
-    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
-        w = csv.DictWriter(f, fieldnames=ordered)
+    # Resolve every row to a list up front and hand them to writerows in one
+    # call; a 1 MiB buffer keeps the number of write syscalls small.
+    row_values = [[r.get(h, '') for h in ordered] for r in rows]
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='', buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(ordered)
+        w.writerows(row_values)
+    write_csv_sidecar(csv_path, ordered, row_values)
+    return ordered
+
+def _sidecar_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + '.rows.json'
+
+def _csv_cell(v) -> str:
+    """A value as csv.writer writes it, so the sidecar reads back like the CSV."""
+    return v if type(v) is str else ('' if v is None else str(v))
+
+def _csv_stamp(csv_path: str) -> List[int]:
+    st = os.stat(csv_path)
+    return [st.st_size, st.st_mtime_ns]
+
+def write_csv_sidecar(csv_path: str, headers: List[str], row_values: List[list]) -> None:
+    """
+    Save what write_csv just wrote next to csv_path, dictionary-encoded: each
+    distinct cell value (location, stance, blanks, ...) is stored once and rows
+    are lists of indexes into it, so a load also allocates each value once:
+    about half the memory of parsing the CSV, though no faster. The CSV's
+    size and mtime are recorded; the CSV stays the record.
+    """
+    if not CSV_SIDECAR:
+        return
+    path = _sidecar_path(csv_path)
+    pool: Dict[str, int] = {}
+    rows = [[pool.setdefault(v, len(pool)) for v in map(_csv_cell, vals)] for vals in row_values]
+    try:
+        with replaced_atomically(path) as tmp, open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'csv': _csv_stamp(csv_path), 'headers': headers,
+                       'values': list(pool), 'rows': rows}, f, separators=(',', ':'))
+    except OSError as e:
+        log.warning("    !! Could not write %s: %s", path, e)
+
+def read_csv_sidecar(csv_path: str) -> Optional[Tuple[List[dict], List[str]]]:
+    """
+    (rows, normalized headers) as load_existing_csv would read them from
+    csv_path, taken from its sidecar. None unless the sidecar was written for
+    exactly this file: same size and mtime, so a checkpoint append, a hand
+    edit or a restored older copy all fall back to parsing the CSV.
+    """
+    if not CSV_SIDECAR:
+        return None
+    try:
+        with open(_sidecar_path(csv_path), encoding='utf-8') as f:
+            side = json.load(f)
+        if side['csv'] != _csv_stamp(csv_path):
+            return None
+        values = side['values']
+        norm_headers = [norm_key(h) for h in side['headers']]
+        return [dict(zip(norm_headers, [values[i] for i in idx])) for idx in side['rows']], norm_headers
+    except Exception:
+        return None  # missing, stale or unreadable: parse the CSV
+
+def open_csv_checkpoint(csv_path, csv_headers, headers_priority):
+    """
+    Open csv_path for appending fights as each card finishes, so a crash
+    mid-run keeps what was already scraped. Rows go under the file's existing
+    header (a new file gets headers_priority); columns outside it are dropped
+    here and come back with the final write_csv rewrite. Returns (file, writer).
+    """
+    ensure_csv_dir(csv_path)
+    f = open(csv_path, 'a', encoding='utf-8-sig', newline='')  # BOM only if the file is empty
+    w = csv.DictWriter(f, fieldnames=csv_headers or headers_priority, extrasaction='ignore')
+    if not csv_headers:
         w.writeheader()
-        for r in rows:
-            w.writerow({h: r.get(h, '') for h in ordered})
+    return f, w
 
 # ---------- Enrichment: born/gym backfill, UFC counters, active flags ----------
 
@@ -534,48 +950,61 @@ PROFILE_ATTRS = [
     'slpm','str_acc','sapm','str_def','td_avg','td_acc','td_def','sub_avg'
 ]
 
-def build_fighter_kb(rows: List[dict]) -> Dict[str, dict]:
+def fighter_appearances(rows: List[dict]) -> List[Tuple[str, int, str, Optional[date]]]:
+    """
+    Long form of rows, shared by the enrichment passes: one
+    (normalized fighter, row index, side, event date) per named fighter slot,
+    in row order (fighter_1 before fighter_2). Names and dates are read once.
+    """
+    apps = []
+    for i, r in enumerate(rows):
+        d = row_date(r)
+        for side, key in zip(('fighter_1', 'fighter_2'), row_names(r)):
+            if r.get(side, ''):
+                apps.append((key, i, side, d))
+    return apps
+
+def _kb_from_sightings(sightings: List[Tuple[str, date, str, str]]) -> Dict[str, dict]:
+    """build_fighter_kb core: (fighter, date, born, gym) in row order -> KB entries."""
+    kb: Dict[str, dict] = {}
+    for key, d, born_val, gym_val in sightings:
+        kbe = kb.setdefault(key, {
+            'born_counts': Counter(),
+            'born_timeline': [],
+            'gym_counts': Counter(),
+            'gym_timeline': [],
+            'last_seen_date': date.min,
+        })
+        if not is_blank(born_val):
+            kbe['born_counts'][born_val] += 1
+            kbe['born_timeline'].append((d, born_val))
+        if not is_blank(gym_val):
+            kbe['gym_counts'][gym_val] += 1
+            kbe['gym_timeline'].append((d, gym_val))
+        if d > kbe['last_seen_date']:
+            kbe['last_seen_date'] = d
+
+    # sort timelines; gym_dates mirrors gym_timeline for bisect lookups
+    for kbe in kb.values():
+        kbe['born_timeline'].sort(key=lambda x: x[0])
+        kbe['gym_timeline'].sort(key=lambda x: x[0])
+        kbe['gym_dates'] = [d for d, _ in kbe['gym_timeline']]
+    return kb
+
+def build_fighter_kb(rows: List[dict], apps: List[Tuple[str, int, str, Optional[date]]]) -> Dict[str, dict]:
     """
     Build a per-fighter KB:
       - born_counts: Counter of 'born'
       - born_timeline: list[(date, born)]
       - gym_counts: Counter of 'gym'
       - gym_timeline: list[(date, gym)]
+      - gym_dates: the gym_timeline dates, sorted, for bisect
       - last_seen_date: most recent event date (for active flag)
+    apps is fighter_appearances(rows).
     """
-    kb: Dict[str, dict] = {}
-    for r in rows:
-        d = parse_date_to_obj(r.get('event_date', ''))
-        if not d:
-            continue
-        for side in ('fighter_1', 'fighter_2'):
-            name = r.get(side, '')
-            if not name:
-                continue
-            key = norm_name(name)
-            kbe = kb.setdefault(key, {
-                'born_counts': Counter(),
-                'born_timeline': [],
-                'gym_counts': Counter(),
-                'gym_timeline': [],
-                'last_seen_date': date.min,
-            })
-            born_val = r.get(f'{side}_born', '')
-            if not is_blank(born_val):
-                kbe['born_counts'][born_val] += 1
-                kbe['born_timeline'].append((d, born_val))
-            gym_val = r.get(f'{side}_gym', '')
-            if not is_blank(gym_val):
-                kbe['gym_counts'][gym_val] += 1
-                kbe['gym_timeline'].append((d, gym_val))
-            if d > kbe['last_seen_date']:
-                kbe['last_seen_date'] = d
-
-    # sort timelines
-    for kbe in kb.values():
-        kbe['born_timeline'].sort(key=lambda x: x[0])
-        kbe['gym_timeline'].sort(key=lambda x: x[0])
-    return kb
+    sightings = [(key, d, rows[i].get(f'{side}_born', ''), rows[i].get(f'{side}_gym', ''))
+                 for key, i, side, d in apps if d]
+    return _kb_from_sightings(sightings)
 
 def choose_mode_with_recent_fallback(counter: Counter, timeline: List[Tuple[date, str]]) -> Optional[str]:
     if counter:
@@ -594,360 +1023,227 @@ def choose_mode_with_recent_fallback(counter: Counter, timeline: List[Tuple[date
             return val
     return None
 
-def find_gym_for_date(timeline: List[Tuple[date, str]], target: date, mode_value: Optional[str]) -> Optional[str]:
-    # last <= target
-    prev_val = None
-    for d, val in timeline:
-        if d <= target and not is_blank(val):
-            prev_val = val
-        if d > target:
-            break
-    if prev_val:
-        return prev_val
-    # earliest >= target
-    for d, val in timeline:
-        if d >= target and not is_blank(val):
-            return val
-    # fallback to mode
-    return mode_value
-
-def backfill_born_gym(rows: List[dict], kb: Dict[str, dict]) -> None:
-    for r in rows:
-        d = parse_date_to_obj(r.get('event_date', '')) or date.min
-        for side in ('fighter_1', 'fighter_2'):
-            name = r.get(side, '')
-            if not name:
-                continue
-            key = norm_name(name)
-            info = kb.get(key)
-            if not info:
-                continue
-
-            # born
-            col_born = f'{side}_born'
-            if is_blank(r.get(col_born, '')):
-                born_best = choose_mode_with_recent_fallback(info['born_counts'], info['born_timeline'])
-                if born_best and not is_blank(born_best):
-                    r[col_born] = born_best
-
-            # gym
-            col_gym = f'{side}_gym'
-            if is_blank(r.get(col_gym, '')):
-                gym_mode = info['gym_counts'].most_common(1)[0][0] if info['gym_counts'] else None
-                gym_best = find_gym_for_date(info['gym_timeline'], d, gym_mode)
-                if gym_best and not is_blank(gym_best):
-                    r[col_gym] = gym_best
-
-def compute_ufc_counters(rows: List[dict]) -> None:
+def find_gym_for_date(timeline: List[Tuple[date, str]], dates: List[date], target: date,
+                      mode_value: Optional[str]) -> Optional[str]:
+    """
+    Gym on the latest timeline entry <= target, else the earliest one after it,
+    else mode_value. dates is the sorted date column of timeline, which only
+    holds non-blank gyms (see _kb_from_sightings), so one bisect finds the answer.
+    """
+    if not timeline:
+        return mode_value
+    # last <= target, or earliest > target when there is none
+    i = bisect.bisect_right(dates, target) - 1
+    return timeline[max(i, 0)][1]
+
+def backfill_born_gym(r: dict, side: str, info: dict, d: date) -> None:
+    """Fill a blank {side}_born / {side}_gym of row r (event date d) from the fighter's KB entry."""
+    # born
+    col_born = f'{side}_born'
+    if is_blank(r.get(col_born, '')):
+        born_best = choose_mode_with_recent_fallback(info['born_counts'], info['born_timeline'])
+        if born_best and not is_blank(born_best):
+            r[col_born] = born_best
+
+    # gym
+    col_gym = f'{side}_gym'
+    if is_blank(r.get(col_gym, '')):
+        gym_mode = info['gym_counts'].most_common(1)[0][0] if info['gym_counts'] else None
+        gym_best = find_gym_for_date(info['gym_timeline'], info['gym_dates'], d, gym_mode)
+        if gym_best and not is_blank(gym_best):
+            r[col_gym] = gym_best
+
+def _count_bouts(bouts: List[Tuple[str, int, str, bool, bool]]) -> List[Tuple[int, str, int, int]]:
+    """compute_ufc_counters core: (fighter, row, side, won, lost) in date order -> (row, side, wins, losses) before the bout."""
+    record: Dict[str, Tuple[int, int]] = {}
+    out = []
+    for n, i, side, won, lost in bouts:
+        wins, losses = record.get(n, (0, 0))
+        out.append((i, side, wins, losses))
+        record[n] = (wins + won, losses + lost)
+    return out
+
+def compute_ufc_counters(rows: List[dict], apps: List[Tuple[str, int, str, Optional[date]]]) -> None:
     """
     For each fighter, sort fights by date and set:
       - fighter_[1|2]_ufcwins / fighter_[1|2]_ufcloss BEFORE that fight.
-    Assumes every row is a UFC bout (true for UFCStats).
+    Assumes every row is a UFC bout (true for UFCStats). apps is fighter_appearances(rows).
     """
-    timeline = defaultdict(list)  # fighter -> [(date, side, row)]
-    for r in rows:
-        d = parse_date_to_obj(r.get('event_date', '')) or date.min
-        n1 = norm_name(r.get('fighter_1', ''))
-        n2 = norm_name(r.get('fighter_2', ''))
-        if n1: timeline[n1].append((d, 'f1', r))
-        if n2: timeline[n2].append((d, 'f2', r))
-
-    for fighter, items in timeline.items():
-        items.sort(key=lambda x: x[0])  # chronological
-        wins = losses = 0
-        for d, side, r in items:
-            # write counters BEFORE the fight
-            if side == 'f1':
-                r['fighter_1_ufcwins'] = str(wins)
-                r['fighter_1_ufcloss'] = str(losses)
-            else:
-                r['fighter_2_ufcwins'] = str(wins)
-                r['fighter_2_ufcloss'] = str(losses)
-
-            # update AFTER the fight based on fighter_1-centric "result"
-            res = (r.get('result', '') or '').strip().lower()
-            # treat draw/NC as no change
-            if res.startswith('win'):
-                if side == 'f1':
-                    wins += 1
-                else:
-                    losses += 1
-            elif res.startswith('loss') or res.startswith('l'):
-                if side == 'f1':
-                    losses += 1
-                else:
-                    wins += 1
-            # else: draw/NC -> no change
-
-def apply_active_flags(rows: List[dict], years: int = 3) -> None:
-    """fighter_[1|2]_active = TRUE if last fight ≤ 3 years ago (relative to today)."""
-    last_seen: Dict[str, date] = {}
-    for r in rows:
-        d = parse_date_to_obj(r.get('event_date', ''))
-        if not d:
+    # One stable sort of the appearances by date, then running per-fighter
+    # totals (a groupby cumsum/shift): each fighter's bouts are still seen
+    # chronologically, ties in file order, without a timeline per fighter.
+    bouts = []
+    for n, i, side, _ in sorted(apps, key=lambda a: a[3] or date.min):
+        if not n:
             continue
-        for side in ('fighter_1', 'fighter_2'):
-            n = norm_name(r.get(side, ''))
-            if not n:
-                continue
-            if (n not in last_seen) or (d > last_seen[n]):
-                last_seen[n] = d
+        # fighter_1-centric "result"; treat draw/NC as no change
+        res = (rows[i].get('result', '') or '').strip().lower()
+        f1_won = res.startswith('win')
+        f1_lost = not f1_won and (res.startswith('loss') or res.startswith('l'))
+        if side == 'fighter_1':
+            bouts.append((n, i, side, f1_won, f1_lost))
+        else:
+            bouts.append((n, i, side, f1_lost, f1_won))
 
-    today = date.today()
-    cutoff_days = int(365.25 * years)
+    for i, side, wins, losses in _count_bouts(bouts):
+        rows[i][f'{side}_ufcwins'] = str(wins)
+        rows[i][f'{side}_ufcloss'] = str(losses)
 
+def enrich_rows(rows: List[dict], years: int = 3) -> None:
+    """
+    All post-scrape enrichment, over one shared fighter_appearances() view:
+      - backfill blank born/gym from the per-fighter KB
+      - fighter_[1|2]_ufcwins / _ufcloss before each fight
+      - fighter_[1|2]_active = TRUE if last fight ≤ `years` years ago (relative to today)
+    Backfill and active flags share one sweep, reading last_seen_date from the KB.
+    """
+    apps = fighter_appearances(rows)
+    kb = build_fighter_kb(rows, apps)
+    compute_ufc_counters(rows, apps)
+
+    cutoff = date.today() - timedelta(days=int(365.25 * years))
     for r in rows:
-        for side in ('fighter_1', 'fighter_2'):
-            n = norm_name(r.get(side, ''))
-            active = False
-            last = last_seen.get(n)
-            if last:
-                active = (today - last).days <= cutoff_days
-            r[f'{side}_active'] = 'TRUE' if active else 'FALSE'
+        d = row_date(r) or date.min
+        for side, key in zip(('fighter_1', 'fighter_2'), row_names(r)):
+            info = kb.get(key) if r.get(side, '') else None
+            if info:
+                backfill_born_gym(r, side, info, d)
+            r[f'{side}_active'] = 'TRUE' if key and info and info['last_seen_date'] >= cutoff else 'FALSE'
 
 # ---------- Main ----------
 
-def main():
-    # Priority columns (includes requested new columns)
-    fieldnames_priority = [
-        'event_date', 'event_location', 'fighter_1', 'fighter_2', 'result',
-        'method_main', 'method_detail', 'round', 'time',
-        'fighter_1_kd', 'fighter_1_str', 'fighter_1_td', 'fighter_1_sub',
-        'fighter_2_kd', 'fighter_2_str', 'fighter_2_td', 'fighter_2_sub',
-        'weight_class',
-        'fighter_1_record', 'fighter_1_height', 'fighter_1_weight', 'fighter_1_reach',
-        'fighter_1_stance', 'fighter_1_dob',
-        'fighter_1_slpm','fighter_1_str_acc','fighter_1_sapm','fighter_1_str_def',
-        'fighter_1_td_avg','fighter_1_td_acc','fighter_1_td_def','fighter_1_sub_avg',
-        'fighter_2_record', 'fighter_2_height', 'fighter_2_weight', 'fighter_2_reach',
-        'fighter_2_stance', 'fighter_2_dob',
-        'fighter_2_slpm','fighter_2_str_acc','fighter_2_sapm','fighter_2_str_def',
-        'fighter_2_td_avg','fighter_2_td_acc','fighter_2_td_def','fighter_2_sub_avg',
-        # New/derived columns you asked for:
-        'fighter_1_born','fighter_1_gym','fighter_2_born','fighter_2_gym',
-        'fighter_1_ufcwins','fighter_1_ufcloss','fighter_2_ufcwins','fighter_2_ufcloss',
-        'fighter_1_active','fighter_2_active',
-        # Fight details (NEW):
-        'f1_total_kd','f2_total_kd',
-        'f1_sig_str_landed','f1_sig_str_attempted','f1_sig_str_pct',
-        'f2_sig_str_landed','f2_sig_str_attempted','f2_sig_str_pct',
-        'f1_total_str_landed','f1_total_str_attempted',
-        'f2_total_str_landed','f2_total_str_attempted',
-        'f1_td_landed','f1_td_attempted','f1_td_pct',
-        'f2_td_landed','f2_td_attempted','f2_td_pct',
-        'f1_sub_att','f2_sub_att',
-        'f1_reversals','f2_reversals',
-        'f1_ctrl_time','f2_ctrl_time',
-        'f1_head_landed','f1_head_attempted',
-        'f2_head_landed','f2_head_attempted',
-        'f1_body_landed','f1_body_attempted',
-        'f2_body_landed','f2_body_attempted',
-        'f1_leg_landed','f1_leg_attempted',
-        'f2_leg_landed','f2_leg_attempted',
-        'f1_distance_landed','f1_distance_attempted',
-        'f2_distance_landed','f2_distance_attempted',
-        'f1_clinch_landed','f1_clinch_attempted',
-        'f2_clinch_landed','f2_clinch_attempted',
-        'f1_ground_landed','f1_ground_attempted',
-        'f2_ground_landed','f2_ground_attempted',
-        # If you already have these in your CSV, keeping them here ensures stable ordering:
-        'fighter_1_wins','fighter_2_wins',
-    ]
-
-    _, key_to_row, _, max_date = load_existing_csv(CSV_PATH)
+def log_fight_details(f1_name: str, f2_name: str, fight_url: Optional[str], fight_details: dict) -> None:
+    if not fight_url:
+        log.debug("    ⚠️  %s vs %s - No fight details URL found", f1_name, f2_name)
+        return
+    log.debug("    📥 %s vs %s", f1_name, f2_name)
+    log.debug("       Getting details from: %s", fight_url)
+    if not fight_details:
+        log.debug("       ⚠️  No detailed stats found")
+        return
+    log.debug("       ✅ Got %d stats:", len(fight_details))
+    for label, stat in (('F1 Sig Strikes', 'f1_sig_str'), ('F2 Sig Strikes', 'f2_sig_str'),
+                        ('F1 Head', 'f1_head'), ('F2 Head', 'f2_head')):
+        log.debug("          %s: %s of %s", label,
+                  fight_details.get(f'{stat}_landed', 'N/A'), fight_details.get(f'{stat}_attempted', 'N/A'))
+
+async def main():
+    # stdout, like the startup and summary prints, so one redirect keeps the whole run in order
+    logging.basicConfig(level=LOG_LEVEL, format='%(message)s', stream=sys.stdout)
+
+    _, key_to_row, csv_headers, max_date, csv_encoding = load_existing_csv(CSV_PATH)
     print(f"Latest date in CSV: {max_date if max_date else 'None'}")
-
-    event_links = get_event_links()
-    print(f"\n📊 Found {len(event_links)} total events")
-        
-    # LIMIT TO FIRST 5 FOR TESTING
-  testr    
-    total_new = total_updated = 0
-
-    for i, event_link in enumerate(event_links, 1):
-        soup, event_date_obj, event_date_str, event_loc = extract_event_meta(event_link)
-
-        # Date gating (list is newest -> oldest)
-        if not BACKFILL_ALL and (max_date is not None):
-            if UPDATE_EXISTING:
-                if (event_date_obj is None) or (event_date_obj < max_date):
-                    break
-            else:
-                if (event_date_obj is None) or (event_date_obj <= max_date):
-                    break
-
-        print(f"\n[{i}/{len(event_links)}] {event_date_str} | {event_loc}")
-
-        table = soup.find('table', class_='b-fight-details__table')
-        if not table:
-            print("  (No fight table)")
-            continue
-
-        new_count = updated_count = 0
-
-        for row in table.find_all('tr')[1:]:
-            cols = row.find_all('td')
-            if len(cols) < 10:
-                continue
-
-            # Get fighter names and their detail links
-            fighter_links = cols[1].find_all('a')
-            if len(fighter_links) < 2:
-                continue
-            f1_tag, f2_tag = fighter_links[0], fighter_links[1]
-            f1_name, f2_name = f1_tag.text.strip(), f2_tag.text.strip()
-
-            k = legacy_key(event_date_str, f1_name, f2_name)
-            have_already = k in key_to_row
-
-            # Skip heavy requests if already in CSV and not refreshing
-            if have_already and not UPDATE_EXISTING:
-                continue
-
-            result = cols[0].text.strip()
-            method_ps = cols[7].find_all("p")
-            method_main = method_ps[0].text.strip() if method_ps else ""
-            method_detail = method_ps[1].text.strip() if len(method_ps) > 1 else ""
-            round_ = cols[8].text.strip()
-            time_ = cols[9].text.strip()
-
-            f1_kd, f2_kd = split_stat(cols[2])
-            f1_str, f2_str = split_stat(cols[3])
-            f1_td,  f2_td  = split_stat(cols[4])
-            f1_sub, f2_sub = split_stat(cols[5])
-            weight_class = ' '.join(cols[6].text.split())
-
-            # Heavy only when needed (new or updating)
-            f1_stats = scrape_fighter_details(f1_tag['href'])
-            time.sleep(SLEEP_BETWEEN_REQUESTS)
-            f2_stats = scrape_fighter_details(f2_tag['href'])
-            time.sleep(SLEEP_BETWEEN_REQUESTS)
-            
-            # NEW: Get detailed fight stats from individual fight page
-            # The fight details link is in the fighter name column (cols[1])
-            fight_details = {}
-            fight_url = None
-            
-            # Try to find the fight details link
-            # It's usually an onclick or data attribute on the row, or we construct it
-            # For UFCStats, we need to construct the URL from the event page
-            # The fight links are actually embedded in each row's data-link attribute or similar
-            
-            # Let's try finding it in the row itself
-            parent_tr = cols[0].find_parent('tr')
-            if parent_tr:
-                # Look for data-link attribute or any link in the row
-                for a_tag in parent_tr.find_all('a'):
-                    href = a_tag.get('href', '')
-                    if '/fight-details/' in href:
-                        fight_url = href
-                        break
-            
-            if not fight_url:
-                # If we can't find it in the row, try the result column
-                result_links = cols[0].find_all('a')
-                for link in result_links:
-                    href = link.get('href', '')
-                    if '/fight-details/' in href:
-                        fight_url = href
-                        break
-            
-            # If we found a fight URL, scrape details
-            if fight_url:
-                print(f"    📥 {f1_name} vs {f2_name}")
-                print(f"       Getting details from: {fight_url}")
-                fight_details = scrape_fight_details(fight_url)
-                
-                # DEBUG: Show what we got
-                if fight_details:
-                    print(f"       ✅ Got {len(fight_details)} stats:")
-                    print(f"          F1 Sig Strikes: {fight_details.get('f1_sig_str_landed', 'N/A')} of {fight_details.get('f1_sig_str_attempted', 'N/A')}")
-                    print(f"          F2 Sig Strikes: {fight_details.get('f2_sig_str_landed', 'N/A')} of {fight_details.get('f2_sig_str_attempted', 'N/A')}")
-                    print(f"          F1 Head: {fight_details.get('f1_head_landed', 'N/A')} of {fight_details.get('f1_head_attempted', 'N/A')}")
-                    print(f"          F2 Head: {fight_details.get('f2_head_landed', 'N/A')} of {fight_details.get('f2_head_attempted', 'N/A')}")
-                else:
-                    print(f"       ⚠️  No detailed stats found")
-                
-                time.sleep(SLEEP_BETWEEN_REQUESTS)
-            else:
-                print(f"    ⚠️  {f1_name} vs {f2_name} - No fight details URL found")
-
-            rowdict = {
-                'event_date': event_date_str,
-                'event_location': event_loc,
-                'fighter_1': f1_name,
-                'fighter_2': f2_name,
-                'result': result,
-                'method_main': method_main,
-                'method_detail': method_detail,
-                'round': round_,
-                'time': time_,
-                'fighter_1_kd': f1_kd,
-                'fighter_1_str': f1_str,
-                'fighter_1_td': f1_td,
-                'fighter_1_sub': f1_sub,
-                'fighter_2_kd': f2_kd,
-                'fighter_2_str': f2_str,
-                'fighter_2_td': f2_td,
-                'fighter_2_sub': f2_sub,
-                'weight_class': weight_class,
-                'fighter_1_record': f"'{f1_stats['record']}",
-                'fighter_1_height': f1_stats['height'],
-                'fighter_1_weight': f1_stats['weight'],
-                'fighter_1_reach': f1_stats['reach'],
-                'fighter_1_stance': f1_stats['stance'],
-                'fighter_1_dob': f1_stats['dob'],
-                'fighter_2_record': f"'{f2_stats['record']}",
-                'fighter_2_height': f2_stats['height'],
-                'fighter_2_weight': f2_stats['weight'],
-                'fighter_2_reach': f2_stats['reach'],
-                'fighter_2_stance': f2_stats['stance'],
-                'fighter_2_dob': f2_stats['dob'],
-            }
-
-            # Map career stats to your lowercase schema
-            rowdict.update(map_stats('fighter_1', f1_stats))
-            rowdict.update(map_stats('fighter_2', f2_stats))
-            
-            # Add detailed fight stats
-            rowdict.update(fight_details)
-
-            if have_already:
-                merged = merge_rows(key_to_row[k], rowdict)
-                if merged != key_to_row[k]:
-                    key_to_row[k] = merged
-                    updated_count += 1
-            else:
-                key_to_row[k] = rowdict
-                new_count += 1
-
-        total_new += new_count
-        total_updated += updated_count
-        print(f"  Added: {new_count} | Updated: {updated_count} | Total so far: {len(key_to_row)}")
-        time.sleep(SLEEP_BETWEEN_REQUESTS)
+    if csv_encoding not in (None, 'utf-8') or not set(FIELDNAMES_PRIORITY) <= set(csv_headers or FIELDNAMES_PRIORITY):
+        # The checkpoint appends UTF-8 rows under the file's header. Rewrite a
+        # legacy-encoded file, or one missing columns, first (as the final write
+        # would), so a crash never leaves mixed encodings or drops scraped columns
+        csv_headers = write_csv(CSV_PATH, list(key_to_row.values()), FIELDNAMES_PRIORITY)
+
+    global _fetch_sem, _rate_limit, _parse_pool
+    _fetch_sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    _rate_limit = HostRateLimiter(RATE_LIMIT)
+    checkpoint, checkpoint_writer = open_csv_checkpoint(CSV_PATH, csv_headers, FIELDNAMES_PRIORITY)
+    _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    try:
+        # One pooled keep-alive session for the whole run: TCP connects and DNS
+        # lookups are paid once per host, not per page.
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=MAX_CONCURRENCY,
+                                         keepalive_timeout=30, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as session:
+            events = await get_event_links(session)
+            print(f"\n📊 Found {len(events)} total events")
+            # Date gating on the listing (newest -> oldest): no event page past the
+            # cutoff is fetched just to read its date
+            if not BACKFILL_ALL and (max_date is not None):
+                events = events[:events_through_cutoff(events, max_date, inclusive=UPDATE_EXISTING)]
+            # Cards run oldest first, so the CSV always holds a contiguous run of
+            # dates and the next run's max_date resumes where this one stopped,
+            # whether it crashed or MAX_EVENTS cut it short.
+            event_links = [link for link, _ in reversed(events)][:MAX_EVENTS]
+
+            total_new = total_updated = 0
+            # Fights new this run are appended here; key_to_row keeps only the CSV's
+            # rows, which an update merges in place. seen_keys covers both.
+            new_rows: List[dict] = []
+            seen_keys = set(key_to_row)
+
+            # Events are fetched EVENT_BATCH at a time and their fighter/fight pages
+            # all at once, then applied in run order, so the output matches a
+            # one-by-one run.
+            for start in range(0, len(event_links), EVENT_BATCH):
+                batch = event_links[start:start + EVENT_BATCH]
+                metas = await asyncio.gather(*[extract_event_meta(session, link) for link in batch])
+
+                cards = []  # (i, event_date_str, event_loc, parse_card() result)
+                for i, (fights, _, event_date_str, event_loc) in enumerate(metas, start + 1):
+                    cards.append((i, event_date_str, event_loc, parse_card(fights, event_date_str, event_loc, seen_keys, key_to_row)))
+
+                # Heavy only when needed (new or updating): every fighter and fight
+                # page of the batch concurrently, bounded by _fetch_sem.
+                details = await asyncio.gather(*[fetch_card(session, card[0] if card else []) for *_, card in cards])
+
+                for (i, event_date_str, event_loc, card), results in zip(cards, details):
+                    log.info("\n[%d/%d] %s | %s", i, len(event_links), event_date_str, event_loc)
+                    if card is None:
+                        log.info("  (No fight table)")
+                        continue
+                    pending, complete = card
+
+                    new_count = updated_count = 0
+                    card_start = len(new_rows)
+
+                    for (k, rowdict, _, _, fight_url), result in zip(pending, results):
+                        f1_name, f2_name = rowdict['fighter_1'], rowdict['fighter_2']
+                        if isinstance(result, Exception):
+                            log.warning("    !! %s vs %s - skipped, scrape failed: %r", f1_name, f2_name, result)
+                            continue
+                        _, fight_details = result
+
+                        # Per-fight detail is debug-only: skipped outright unless LOG_LEVEL asks for it
+                        if log.isEnabledFor(logging.DEBUG):
+                            log_fight_details(f1_name, f2_name, fight_url, fight_details)
+
+                        if k in key_to_row:
+                            merged, changed = merge_rows(key_to_row[k], rowdict)
+                            if changed:
+                                key_to_row[k] = merged
+                                updated_count += 1
+                        elif k not in seen_keys:
+                            new_rows.append(rowdict)
+                            seen_keys.add(k)
+                            new_count += 1
+                        # else: scraped on an earlier card this run; the first copy stands
+
+                    checkpoint_writer.writerows(new_rows[card_start:])
+                    checkpoint.flush()
+                    total_new += new_count
+                    total_updated += updated_count
+                    if complete:
+                        log.info("  Skipped complete: %d", complete)
+                    log.info("  Added: %d | Updated: %d | Total so far: %d",
+                             new_count, updated_count, len(key_to_row) + len(new_rows))
+    finally:
+        # Workers and the checkpoint are released even when the scrape fails
+        _parse_pool.shutdown()
+        _parse_pool = None
+        checkpoint.close()
 
     # -------- After scraping: enrich from existing data --------
-    final_rows = list(key_to_row.values())
-
-    # 1) Build fighter knowledge base and backfill born/gym
-    kb = build_fighter_kb(final_rows)
-    backfill_born_gym(final_rows, kb)
-
-    # 2) Compute UFC wins/losses at time of fight
-    compute_ufc_counters(final_rows)
+    final_rows = list(key_to_row.values()) + new_rows
 
-    # 3) Apply active flags (last 3 years)
-    apply_active_flags(final_rows, years=3)
+    # Backfill born/gym, UFC wins/losses at time of fight, active flags (last 3 years)
+    enrich_rows(final_rows, years=3)
 
     # Write out everything (existing + new)
-    write_csv(CSV_PATH, final_rows, fieldnames_priority)
+    write_csv(CSV_PATH, final_rows, FIELDNAMES_PRIORITY)
     print(f"\n✅ Done. {len(final_rows)} total unique fights saved to '{CSV_PATH}'")
     print(f"New this run: {total_new} | Updated: {total_updated}")
     
     # TEST MODE SUMMARY
     print("\n" + "="*60)
     print("="*60)
-    print(f"Events scraped: 5")
+    print(f"Events scraped: {len(event_links)}")
     print(f"Total fights in CSV: {len(final_rows)}")
     print(f"New fights added: {total_new}")
     print(f"Fights updated: {total_updated}")
@@ -961,4 +1257,4 @@ def main():
     print("="*60)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())